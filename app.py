@@ -8,20 +8,52 @@ Includes endpoints for:
 - Landing page (`/`)
 - Health check (`/ping`)
 - Very late shipment prediction (`/predict_very_late`)
+- Batch prediction for a list of shipments (`/predict_batch`)
 """
 
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
 from pathlib import Path
-import pandas as pd
+import numpy as np
 import joblib
+import orjson
 import json
 import random
 import datetime
+import functools
+import gzip
+import hashlib
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from sklearn.preprocessing import RobustScaler, StandardScaler
 from src.preprocess_features import NUMERICAL_FEATURES, ONEHOT_FEATURES, LABEL_FEATURES
 from src.logger import get_logger
+from src.onnx_model import load_onnx_model
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson for request parsing and jsonify responses"""
+
+    OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.OPTIONS).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping the str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=self.OPTIONS), mimetype="application/json")
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+# Let browsers reuse static/ assets (e.g. charts.js) for as long as the HTML pages
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 3600
 logger = get_logger(__name__)
 
 # Define paths
@@ -31,6 +63,12 @@ onehot_encoder_file = base_dir / "models" / "onehot_encoder.pkl"
 ordinal_encoder_file = base_dir / "models" / "ordinal_encoder.pkl"
 late_model_file = base_dir / "models" / "late_model.pkl"
 very_late_model_file = base_dir / "models" / "very_late_model.pkl"
+late_model_onnx_file = base_dir / "models" / "late_model.onnx"
+very_late_model_onnx_file = base_dir / "models" / "very_late_model.onnx"
+static_dir = base_dir / "static"
+
+# ONNX Runtime execution providers, in priority order (e.g. "OpenVINOExecutionProvider,CPUExecutionProvider")
+ONNX_PROVIDERS = os.environ.get("ONNX_PROVIDERS", "CPUExecutionProvider").split(",")
 
 def load_artifact(file, name):
     """Load model artifacts with error handling"""
@@ -39,17 +77,96 @@ def load_artifact(file, name):
     except FileNotFoundError:
         raise Exception(f"{name} not found. Please run the pipeline first to generate required model files.")
 
+def load_model(file, onnx_file, name):
+    """Load a model, preferring its ONNX export when onnxruntime is installed"""
+    model = load_onnx_model(onnx_file, ONNX_PROVIDERS)
+    if model is not None:
+        return model
+    return load_artifact(file, name)
+
+def check_feature_layout(model, name):
+    """Ensure a model expects the column layout that preprocessing produces"""
+    feature_names = getattr(model, "feature_names_in_", None)
+    if feature_names is not None and list(feature_names) != ALL_COLS:
+        raise Exception(f"{name} was trained on a different feature layout than the loaded encoders produce.")
+    if getattr(model, "n_features_in_", len(ALL_COLS)) != len(ALL_COLS):
+        raise Exception(f"{name} expects {model.n_features_in_} features, preprocessing produces {len(ALL_COLS)}.")
+
+def scaling_params(scaler):
+    """
+    Return the (center, scale) vectors a fitted RobustScaler/StandardScaler applies,
+    or None if the scaler is another type a plain (x - center) / scale cannot reproduce
+    """
+    n_features = scaler.n_features_in_
+    if type(scaler) is RobustScaler:
+        center = scaler.center_ if scaler.with_centering else None
+        scale = scaler.scale_ if scaler.with_scaling else None
+    elif type(scaler) is StandardScaler:
+        # mean_ is fitted even with with_mean=False, so check the flag
+        center = scaler.mean_ if scaler.with_mean else None
+        scale = scaler.scale_ if scaler.with_std else None
+    else:
+        return None
+    
+    return (
+        np.zeros(n_features) if center is None else np.array(center, dtype=np.float64),
+        np.ones(n_features) if scale is None else np.array(scale, dtype=np.float64)
+    )
+
+def onehot_lookup(encoder, start):
+    """
+    Map each one-hot feature's categories to their column in the preprocessed row,
+    or return None if the encoder uses options a plain lookup cannot reproduce
+    """
+    if (encoder.drop is not None or encoder.handle_unknown != "ignore"
+            or encoder.min_frequency is not None or encoder.max_categories is not None):
+        return None
+    
+    lookup = []
+    for categories in encoder.categories_:
+        lookup.append({category: start + i for i, category in enumerate(categories.tolist())})
+        start += len(categories)
+    return lookup
+
+def strip_feature_names(estimator):
+    """Drop fitted column names so sklearn skips its per-call feature-name check on ndarray input"""
+    if hasattr(estimator, "feature_names_in_"):
+        del estimator.feature_names_in_
+
 # Load models and preprocessors at startup
 try:
     scaler = load_artifact(scaler_file, "scaler")
     onehot_encoder = load_artifact(onehot_encoder_file, "onehot_encoder")
     ordinal_encoder = load_artifact(ordinal_encoder_file, "ordinal_encoder")
-    late_model = load_artifact(late_model_file, "late_model")
-    very_late_model = load_artifact(very_late_model_file, "very_late_model")
+    late_model = load_model(late_model_file, late_model_onnx_file, "late_model")
+    very_late_model = load_model(very_late_model_file, very_late_model_onnx_file, "very_late_model")
+    
+    # Preprocessed column layout, computed once rather than per request
+    ONEHOT_OUT_COLS = list(onehot_encoder.get_feature_names_out(ONEHOT_FEATURES))
+    ALL_COLS = NUMERICAL_FEATURES + ONEHOT_OUT_COLS + LABEL_FEATURES
+    SCALER_CENTER, SCALER_SCALE = scaling_params(scaler) or (None, None)
+    
+    # Where each feature group lands in the preprocessed matrix
+    NUM_SLICE = slice(0, len(NUMERICAL_FEATURES))
+    ONEHOT_SLICE = slice(NUM_SLICE.stop, NUM_SLICE.stop + len(ONEHOT_OUT_COLS))
+    LABEL_SLICE = slice(ONEHOT_SLICE.stop, len(ALL_COLS))
+    ONEHOT_LOOKUP = onehot_lookup(onehot_encoder, ONEHOT_SLICE.start)
+    
+    # Features are passed as bare ndarrays, so a column-order mismatch would
+    # silently corrupt predictions; check it once here instead
+    check_feature_layout(late_model, "late_model")
+    check_feature_layout(very_late_model, "very_late_model")
+    
+    # Transformers and models were fitted on DataFrames but receive ndarrays
+    # in the verified column order, so their feature-name checks are redundant
+    for estimator in (scaler, onehot_encoder, ordinal_encoder, late_model, very_late_model):
+        strip_feature_names(estimator)
     logger.info("All models and preprocessors loaded successfully")
 except Exception as e:
     logger.error(f"Failed to load models: {e}")
     scaler = onehot_encoder = ordinal_encoder = late_model = very_late_model = None
+    ONEHOT_OUT_COLS = ALL_COLS = SCALER_CENTER = SCALER_SCALE = None
+    NUM_SLICE = ONEHOT_SLICE = LABEL_SLICE = ONEHOT_LOOKUP = None
 
 # Landing page HTML template
 LANDING_PAGE_HTML = """
@@ -232,7 +349,10 @@ LANDING_PAGE_HTML = """
         <li><code>POST /predict_late</code> - Predict late shipments (1+ days)</li>
         <li><code>POST /predict_very_late</code> - Predict very late shipments (3+ days)</li>
         <li><code>POST /predict_both</code> - Get predictions from both models</li>
+        <li><code>POST /predict_batch</code> - Get predictions from both models for a list of shipments</li>
         <li><code>GET /api/shipments</code> - Get real-time shipment data</li>
+        <li><code>GET /api/shipments/stream</code> - Server-sent events stream of shipment updates</li>
+        <li><code>GET /api/trends</code> - Get hourly prediction counts for the analytics page</li>
     </ul>
 
     <script>
@@ -332,44 +452,284 @@ LANDING_PAGE_HTML = """
 </html>
 """
 
+HTML_CACHE_CONTROL = "public, max-age=3600"
+
+class StaticPage:
+    """
+    HTML page encoded once at startup, with a strong ETag for conditional GETs
+    and a gzip variant compressed ahead of time.
+    """
+
+    def __init__(self, html):
+        self.body = html.encode("utf-8")
+        self.etag = hashlib.md5(self.body).hexdigest()
+        self.gzip_body = gzip.compress(self.body, compresslevel=9, mtime=0)
+        self.gzip_etag = f"{self.etag}-gzip"
+
+# The pages contain no template variables, so encode them once at startup
+# rather than running them through Jinja on every request
+LANDING_PAGE = StaticPage(LANDING_PAGE_HTML)
+DASHBOARD_PAGE = StaticPage((static_dir / "dashboard.html").read_text(encoding="utf-8"))
+ANALYTICS_PAGE = StaticPage((static_dir / "analytics.html").read_text(encoding="utf-8"))
+
+def static_html_response(page):
+    """Serve a StaticPage, answering 304 Not Modified when the client's ETag still matches"""
+    if request.accept_encodings["gzip"]:
+        response = app.response_class(page.gzip_body, mimetype="text/html")
+        response.headers["Content-Encoding"] = "gzip"
+        response.set_etag(page.gzip_etag)
+    else:
+        response = app.response_class(page.body, mimetype="text/html")
+        response.set_etag(page.etag)
+    response.headers["Cache-Control"] = HTML_CACHE_CONTROL
+    response.vary.add("Accept-Encoding")
+    return response.make_conditional(request)
+
 @app.route('/')
 def landing_page():
     """Landing page with interactive form"""
-    return render_template_string(LANDING_PAGE_HTML)
+    return static_html_response(LANDING_PAGE)
 
 @app.route('/ping')
 def ping():
     """Health check endpoint"""
     return jsonify({"status": "ok"})
 
-def preprocess_input_data(data):
-    """Common preprocessing function for both models"""
-    # Convert to DataFrame
-    X_unprocessed = pd.DataFrame([data])
+def scale_numerical(X_num):
+    """Apply the fitted scaler's (x - center) / scale in place, skipping sklearn's input validation"""
+    if SCALER_SCALE is None:
+        return scaler.transform(X_num)
     
-    # Feature preprocessing and transformation
-    X_num = X_unprocessed[NUMERICAL_FEATURES]
-    X_onehot = X_unprocessed[ONEHOT_FEATURES]
-    X_label = X_unprocessed[LABEL_FEATURES]
+    X_num -= SCALER_CENTER
+    X_num /= SCALER_SCALE
+    return X_num
+
+def preprocess_input_data(data, out=None):
+    """
+    Common preprocessing function for both models.
+
+    Returns a (1, n_features) float32 row. If `out` is given the row is
+    written into it instead of a new array, so a single caller that
+    predicts before preprocessing again can reuse one buffer.
+    """
+    X_processed = np.empty((1, len(ALL_COLS)), dtype=np.float32) if out is None else out
     
-    # Transform features
-    X_num_scaled = scaler.transform(X_num)
-    X_onehot_encoded = onehot_encoder.transform(X_onehot)
-    X_label_encoded = ordinal_encoder.transform(X_label)
+    # Build plain arrays for each feature group; sklearn does not need
+    # column names at inference, so a single row skips pandas entirely
+    X_num = np.fromiter(
+        (data[k] for k in NUMERICAL_FEATURES), dtype=np.float64, count=len(NUMERICAL_FEATURES)
+    ).reshape(1, -1)
+    X_label = np.array([[data[k] for k in LABEL_FEATURES]], dtype=object)
     
-    # Create DataFrames with proper column names
-    X_num_scaled = pd.DataFrame(X_num_scaled, columns=NUMERICAL_FEATURES, index=X_unprocessed.index)
-    X_onehot_encoded = pd.DataFrame(
-        X_onehot_encoded,
-        columns=onehot_encoder.get_feature_names_out(ONEHOT_FEATURES),
-        index=X_unprocessed.index
-    )
-    X_label_encoded = pd.DataFrame(X_label_encoded, columns=LABEL_FEATURES, index=X_unprocessed.index)
+    # Transform each feature group straight into its slice of the row
+    # (same column order as training)
+    # Out-of-range values become inf here and are rejected by predict_matrix
+    with np.errstate(over="ignore"):
+        X_processed[:, NUM_SLICE] = scale_numerical(X_num)
+    if ONEHOT_LOOKUP is not None:
+        # One-hot for a single row is just a few dict lookups; unknown
+        # categories stay all-zero, matching handle_unknown='ignore'
+        X_processed[:, ONEHOT_SLICE] = 0.0
+        for feature, columns in zip(ONEHOT_FEATURES, ONEHOT_LOOKUP):
+            column = columns.get(data[feature])
+            if column is not None:
+                X_processed[0, column] = 1.0
+    else:
+        X_onehot = np.array([[data[k] for k in ONEHOT_FEATURES]], dtype=object)
+        X_processed[:, ONEHOT_SLICE] = onehot_encoder.transform(X_onehot)
+    X_processed[:, LABEL_SLICE] = ordinal_encoder.transform(X_label)
+    return X_processed
+
+def preprocess_input_batch(data_list):
+    """Preprocess a list of shipment dicts into a single feature matrix"""
+    X_num = np.array([[row[k] for k in NUMERICAL_FEATURES] for row in data_list], dtype=np.float64)
+    X_label = np.array([[row[k] for k in LABEL_FEATURES] for row in data_list], dtype=object)
     
-    # Combine all features
-    X_processed = pd.concat([X_num_scaled, X_onehot_encoded, X_label_encoded], axis=1)
+    X_processed = np.empty((len(data_list), len(ALL_COLS)), dtype=np.float32)
+    # Out-of-range values become inf here and are rejected by predict_matrix
+    with np.errstate(over="ignore"):
+        X_processed[:, NUM_SLICE] = scale_numerical(X_num)
+    if ONEHOT_LOOKUP is not None:
+        # Collect the (row, column) of every known category and set them all
+        # with one fancy-indexed assignment instead of running the encoder
+        rows, columns = [], []
+        for i, data in enumerate(data_list):
+            for feature, lookup in zip(ONEHOT_FEATURES, ONEHOT_LOOKUP):
+                column = lookup.get(data[feature])
+                if column is not None:
+                    rows.append(i)
+                    columns.append(column)
+        X_processed[:, ONEHOT_SLICE] = 0.0
+        X_processed[rows, columns] = 1.0
+    else:
+        X_onehot = np.array([[row[k] for k in ONEHOT_FEATURES] for row in data_list], dtype=object)
+        X_processed[:, ONEHOT_SLICE] = onehot_encoder.transform(X_onehot)
+    X_processed[:, LABEL_SLICE] = ordinal_encoder.transform(X_label)
     return X_processed
 
+class NonFiniteFeatureError(ValueError):
+    """A numeric feature is NaN, infinite, or too large for the float32 feature matrix"""
+
+def predict_matrix(X_processed, model_keys):
+    """Run the models required by model_keys ('late', 'very_late' or 'both', one per row) over X_processed"""
+    # Random Forests predict on C-contiguous float32 (already the case for
+    # preprocessed rows); this saves each model from making its own copy
+    X_processed = np.ascontiguousarray(X_processed, dtype=np.float32)
+    
+    # Values beyond float32 range overflow to inf when written into the
+    # matrix; ONNX Runtime would predict on them silently, so reject them here
+    if not np.isfinite(X_processed).all():
+        raise NonFiniteFeatureError("Numeric features must be finite and within float32 range")
+    late = late_model.predict(X_processed) if any(k != "very_late" for k in model_keys) else None
+    
+    # A shipment 3+ days late is by definition 1+ day late, so 'both' rows the
+    # late model predicts on time skip the very late model entirely
+    rows = [i for i, k in enumerate(model_keys) if k == "very_late" or (k == "both" and late[i])]
+    very_late = np.zeros(len(model_keys), dtype=np.int64)
+    if rows:
+        very_late[rows] = very_late_model.predict(X_processed[rows])
+    
+    results = []
+    for i, key in enumerate(model_keys):
+        if key == "late":
+            results.append(int(late[i]))
+        elif key == "very_late":
+            results.append(int(very_late[i]))
+        else:
+            results.append((int(late[i]), int(very_late[i])))
+    return results
+
+class PredictionBatcher:
+    """
+    Coalesces concurrent single-row predictions into one sklearn call.
+
+    A background thread blocks for the first queued request, then takes every
+    request already queued behind it, so requests that arrive while a batch
+    is being predicted share the next preprocessing pass and predict call.
+    A lone request is processed immediately; the thread only waits (up to
+    `window` seconds) for submitters that have registered but not yet queued.
+    """
+
+    def __init__(self, window, max_batch_size=256):
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._lock = threading.Lock()
+        self._reset()
+        # A forked worker (e.g. gunicorn --preload) must start its own thread
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._pending = 0  # submitted but not yet taken off the queue
+        self._row = None  # only touched by the batcher thread
+
+    def submit(self, data, model_key):
+        """Queue one payload and block until its prediction is ready"""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="prediction-batcher", daemon=True)
+                    self._thread.start()
+        
+        future = Future()
+        with self._lock:
+            self._pending += 1
+        self._queue.put((data, model_key, future))
+        return future.result()
+
+    def _take(self, block, timeout=None):
+        item = self._queue.get(block, timeout)
+        with self._lock:
+            self._pending -= 1
+        return item
+
+    def _run(self):
+        while True:
+            batch = [self._take(block=True)]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self._take(block=False))
+                    continue
+                except queue.Empty:
+                    pass
+                
+                # Nothing queued: only wait if a submitter is mid-put
+                remaining = deadline - time.monotonic()
+                if self._pending <= 0 or remaining <= 0:
+                    break
+                try:
+                    batch.append(self._take(block=True, timeout=remaining))
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process_row(self, data, key):
+        """Predict one payload in the batcher's reusable row buffer"""
+        if self._row is None:
+            self._row = np.empty((1, len(ALL_COLS)), dtype=np.float32)
+        return predict_matrix(preprocess_input_data(data, out=self._row), [key])[0]
+
+    def _process(self, batch):
+        # A lone request (the common case at low load) skips the batch
+        # path's per-call matrix and list allocations
+        if len(batch) == 1:
+            data, key, future = batch[0]
+            try:
+                future.set_result(self._process_row(data, key))
+            except Exception as e:
+                future.set_exception(e)
+            return
+        
+        try:
+            X_processed = preprocess_input_batch([data for data, _, _ in batch])
+            results = predict_matrix(X_processed, [key for _, key, _ in batch])
+        except Exception:
+            # One bad payload must not fail the requests batched with it
+            for data, key, future in batch:
+                try:
+                    future.set_result(self._process_row(data, key))
+                except Exception as e:
+                    future.set_exception(e)
+            return
+        
+        for (_, _, future), result in zip(batch, results):
+            future.set_result(result)
+
+# Upper bound on waiting for a request that is mid-enqueue (0 disables coalescing)
+PREDICT_BATCH_WINDOW_MS = float(os.environ.get("PREDICT_BATCH_WINDOW_MS", 5))
+prediction_batcher = PredictionBatcher(PREDICT_BATCH_WINDOW_MS / 1000) if PREDICT_BATCH_WINDOW_MS > 0 else None
+
+# Models are fixed for the lifetime of the process, so identical feature
+# values always produce identical predictions and can be served from memory.
+PREDICTION_CACHE_SIZE = 4096
+
+# Payload fields the models read; anything else in a request is ignored
+MODEL_FEATURES = NUMERICAL_FEATURES + ONEHOT_FEATURES + LABEL_FEATURES
+
+@functools.lru_cache(maxsize=PREDICTION_CACHE_SIZE)
+def _cached_predict(feature_values, model_key):
+    """Preprocess and predict for a tuple of MODEL_FEATURES values; model_key is 'late', 'very_late' or 'both'"""
+    data = dict(zip(MODEL_FEATURES, feature_values))
+    if prediction_batcher is not None:
+        return prediction_batcher.submit(data, model_key)
+    
+    X_processed = preprocess_input_data(data)
+    logger.debug("X_processed shape: %s", X_processed.shape)
+    return predict_matrix(X_processed, [model_key])[0]
+
+def predict_cached(data, model_key):
+    """
+    Look up (or compute) predictions for a request payload.
+
+    The cache key is only the model features, so extra fields (ids,
+    timestamps, nested metadata) neither split entries nor need to be
+    hashable; a missing feature raises KeyError as before.
+    """
+    feature_values = tuple(data[k] for k in MODEL_FEATURES)
+    return _cached_predict(feature_values, model_key)
+
 @app.route('/predict_late', methods=['POST'])
 def predict_late():
     """Predict late shipments endpoint (1+ days delay)"""
@@ -383,21 +743,21 @@ def predict_late():
         if not data:
             return jsonify({"error": "No JSON data provided"}), 400
         
-        logger.info("Received request to /predict_late endpoint")
-        logger.debug(f"Raw input data: {data}")
-        
-        # Preprocess input data
-        X_processed = preprocess_input_data(data)
-        logger.debug(f"X_processed shape: {X_processed.shape}")
+        # Per-request logging stays at DEBUG with lazy %-formatting: at the
+        # default INFO level nothing is formatted or written to the log file
+        logger.debug("Received request to /predict_late endpoint")
+        logger.debug("Raw input data: %s", data)
         
-        # Generate prediction
-        is_late = late_model.predict(X_processed)[0]
-        logger.info(f"Late prediction generated: {is_late}")
+        # Generate prediction (served from cache for repeated payloads)
+        is_late = predict_cached(data, "late")
+        logger.debug("Late prediction generated: %s", is_late)
         
         return jsonify({"late_prediction": int(is_late)})
         
     except KeyError as e:
         return jsonify({"error": f"Missing required field: {str(e)}"}), 400
+    except NonFiniteFeatureError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Late prediction error: {e}")
         return jsonify({"error": f"Late prediction failed: {str(e)}"}), 500
@@ -415,21 +775,19 @@ def predict_very_late():
         if not data:
             return jsonify({"error": "No JSON data provided"}), 400
         
-        logger.info("Received request to /predict_very_late endpoint")
-        logger.debug(f"Raw input data: {data}")
-        
-        # Preprocess input data
-        X_processed = preprocess_input_data(data)
-        logger.debug(f"X_processed shape: {X_processed.shape}")
+        logger.debug("Received request to /predict_very_late endpoint")
+        logger.debug("Raw input data: %s", data)
         
-        # Generate prediction
-        is_very_late = very_late_model.predict(X_processed)[0]
-        logger.info(f"Very late prediction generated: {is_very_late}")
+        # Generate prediction (served from cache for repeated payloads)
+        is_very_late = predict_cached(data, "very_late")
+        logger.debug("Very late prediction generated: %s", is_very_late)
         
         return jsonify({"very_late_prediction": int(is_very_late)})
         
     except KeyError as e:
         return jsonify({"error": f"Missing required field: {str(e)}"}), 400
+    except NonFiniteFeatureError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Very late prediction error: {e}")
         return jsonify({"error": f"Very late prediction failed: {str(e)}"}), 500
@@ -447,18 +805,13 @@ def predict_both():
         if not data:
             return jsonify({"error": "No JSON data provided"}), 400
         
-        logger.info("Received request to /predict_both endpoint")
-        logger.debug(f"Raw input data: {data}")
+        logger.debug("Received request to /predict_both endpoint")
+        logger.debug("Raw input data: %s", data)
         
-        # Preprocess input data
-        X_processed = preprocess_input_data(data)
-        logger.debug(f"X_processed shape: {X_processed.shape}")
+        # Generate predictions from both models (served from cache for repeated payloads)
+        is_late, is_very_late = predict_cached(data, "both")
         
-        # Generate predictions from both models
-        is_late = late_model.predict(X_processed)[0]
-        is_very_late = very_late_model.predict(X_processed)[0]
-        
-        logger.info(f"Both predictions generated - Late: {is_late}, Very Late: {is_very_late}")
+        logger.debug("Both predictions generated - Late: %s, Very Late: %s", is_late, is_very_late)
         
         return jsonify({
             "late_prediction": int(is_late),
@@ -471,10 +824,45 @@ def predict_both():
         
     except KeyError as e:
         return jsonify({"error": f"Missing required field: {str(e)}"}), 400
+    except NonFiniteFeatureError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Both predictions error: {e}")
         return jsonify({"error": f"Predictions failed: {str(e)}"}), 500
 
+@app.route('/predict_batch', methods=['POST'])
+def predict_batch():
+    """Get predictions from both models for a list of shipments in one pass"""
+    try:
+        # Check if models are loaded
+        if late_model is None or very_late_model is None:
+            return jsonify({"error": "Models not loaded. Please run the pipeline first."}), 500
+        
+        # Get JSON list from request
+        data_list = request.get_json()
+        if not isinstance(data_list, list) or not data_list or not all(isinstance(row, dict) for row in data_list):
+            return jsonify({"error": "Expected a non-empty JSON list of shipments"}), 400
+        
+        logger.debug("Received request to /predict_batch endpoint (%d shipments)", len(data_list))
+        
+        # Preprocess and predict the whole batch at once
+        X_processed = preprocess_input_batch(data_list)
+        logger.debug("X_processed shape: %s", X_processed.shape)
+        predictions = predict_matrix(X_processed, ["both"] * len(data_list))
+        
+        return jsonify([
+            {"late_prediction": is_late, "very_late_prediction": is_very_late}
+            for is_late, is_very_late in predictions
+        ])
+        
+    except KeyError as e:
+        return jsonify({"error": f"Missing required field: {str(e)}"}), 400
+    except NonFiniteFeatureError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Batch prediction error: {e}")
+        return jsonify({"error": f"Batch predictions failed: {str(e)}"}), 500
+
 # Sample data for demonstration
 SAMPLE_LOCATIONS = [
     {"country": "United States", "state": "California", "city": "Los Angeles", "lat": 34.0522, "lng": -118.2437},
@@ -530,458 +918,192 @@ def generate_sample_shipment():
 @app.route('/dashboard')
 def dashboard():
     """Interactive geospatial dashboard"""
-    dashboard_html = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Shipment Risk Dashboard</title>
-        <meta charset="utf-8" />
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <link rel="stylesheet" href="https://unpkg.com/leaflet@1.7.1/dist/leaflet.css" />
-        <script src="https://unpkg.com/leaflet@1.7.1/dist/leaflet.js"></script>
-        <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-        <style>
-            body { font-family: Arial, sans-serif; margin: 0; padding: 0; }
-            .header { background-color: #2c3e50; color: white; padding: 1em; text-align: center; }
-            .dashboard-container { display: flex; height: calc(100vh - 80px); }
-            .map-container { flex: 2; position: relative; }
-            .sidebar { flex: 1; background-color: #f8f9fa; padding: 1em; overflow-y: auto; }
-            #map { height: 100%; width: 100%; }
-            .stats-card { background: white; border-radius: 8px; padding: 1em; margin-bottom: 1em; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-            .stats-number { font-size: 2em; font-weight: bold; color: #2c3e50; }
-            .stats-label { color: #7f8c8d; font-size: 0.9em; }
-            .risk-high { color: #e74c3c; }
-            .risk-medium { color: #f39c12; }
-            .risk-low { color: #27ae60; }
-            .controls { padding: 1em; background: white; margin-bottom: 1em; border-radius: 8px; }
-            .btn { padding: 0.5em 1em; margin: 0.2em; border: none; border-radius: 4px; cursor: pointer; }
-            .btn-primary { background-color: #3498db; color: white; }
-            .btn-success { background-color: #27ae60; color: white; }
-            .btn-danger { background-color: #e74c3c; color: white; }
-            .shipment-list { max-height: 300px; overflow-y: auto; }
-            .shipment-item { padding: 0.5em; border-bottom: 1px solid #eee; font-size: 0.9em; }
-            .chart-container { height: 200px; margin-top: 1em; }
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>🌍 Real-time Shipment Risk Dashboard</h1>
-            <p>Live monitoring of shipment locations and delay predictions</p>
-        </div>
-        
-        <div class="dashboard-container">
-            <div class="map-container">
-                <div id="map"></div>
-            </div>
-            
-            <div class="sidebar">
-                <div class="controls">
-                    <h3>Controls</h3>
-                    <button class="btn btn-primary" onclick="refreshData()">🔄 Refresh Data</button>
-                    <button class="btn btn-success" onclick="toggleAutoRefresh()">⏱️ Auto Refresh</button>
-                    <button class="btn btn-danger" onclick="clearMap()">🗑️ Clear Map</button>
-                </div>
-                
-                <div class="stats-card">
-                    <h3>📊 Live Statistics</h3>
-                    <div style="display: flex; justify-content: space-between;">
-                        <div>
-                            <div class="stats-number" id="totalShipments">0</div>
-                            <div class="stats-label">Total Shipments</div>
-                        </div>
-                        <div>
-                            <div class="stats-number risk-high" id="highRisk">0</div>
-                            <div class="stats-label">High Risk</div>
-                        </div>
-                    </div>
-                </div>
-                
-                <div class="stats-card">
-                    <h3>🎯 Risk Distribution</h3>
-                    <div class="chart-container">
-                        <canvas id="riskChart"></canvas>
-                    </div>
-                </div>
-                
-                <div class="stats-card">
-                    <h3>📦 Recent Shipments</h3>
-                    <div class="shipment-list" id="shipmentList">
-                        <div class="shipment-item">Loading...</div>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <script>
-            let map;
-            let markers = [];
-            let autoRefreshInterval;
-            let riskChart;
-            
-            // Initialize map
-            function initMap() {
-                map = L.map('map').setView([40.7128, -74.0060], 2);
-                
-                L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
-                    attribution: '© OpenStreetMap contributors'
-                }).addTo(map);
-            }
-            
-            // Initialize risk chart
-            function initChart() {
-                const ctx = document.getElementById('riskChart').getContext('2d');
-                riskChart = new Chart(ctx, {
-                    type: 'doughnut',
-                    data: {
-                        labels: ['Low Risk', 'Medium Risk', 'High Risk'],
-                        datasets: [{
-                            data: [0, 0, 0],
-                            backgroundColor: ['#27ae60', '#f39c12', '#e74c3c']
-                        }]
-                    },
-                    options: {
-                        responsive: true,
-                        maintainAspectRatio: false,
-                        plugins: {
-                            legend: {
-                                position: 'bottom'
-                            }
-                        }
-                    }
-                });
-            }
-            
-            // Fetch and display shipments
-            async function refreshData() {
-                try {
-                    const response = await fetch('/api/shipments');
-                    const shipments = await response.json();
-                    
-                    updateMap(shipments);
-                    updateStats(shipments);
-                    updateShipmentList(shipments);
-                    
-                } catch (error) {
-                    console.error('Error fetching data:', error);
-                }
-            }
-            
-            // Update map with shipments
-            function updateMap(shipments) {
-                // Clear existing markers
-                markers.forEach(marker => map.removeLayer(marker));
-                markers = [];
-                
-                shipments.forEach(shipment => {
-                    const riskColor = getRiskColor(shipment.late_risk, shipment.very_late_risk);
-                    const riskLevel = getRiskLevel(shipment.late_risk, shipment.very_late_risk);
-                    
-                    const marker = L.circleMarker([shipment.lat, shipment.lng], {
-                        radius: 8,
-                        fillColor: riskColor,
-                        color: '#fff',
-                        weight: 2,
-                        opacity: 1,
-                        fillOpacity: 0.8
-                    }).addTo(map);
-                    
-                    marker.bindPopup(`
-                        <div style="min-width: 200px;">
-                            <h4>📦 ${shipment.id}</h4>
-                            <p><strong>Location:</strong> ${shipment.order_city}, ${shipment.order_state}</p>
-                            <p><strong>Risk Level:</strong> <span style="color: ${riskColor};">${riskLevel}</span></p>
-                            <p><strong>Late Risk:</strong> ${(shipment.late_risk * 100).toFixed(1)}%</p>
-                            <p><strong>Very Late Risk:</strong> ${(shipment.very_late_risk * 100).toFixed(1)}%</p>
-                            <p><strong>Shipping Mode:</strong> ${shipment.shipping_mode}</p>
-                            <p><strong>Order Value:</strong> $${shipment.order_value}</p>
-                        </div>
-                    `);
-                    
-                    markers.push(marker);
-                });
-            }
-            
-            // Update statistics
-            function updateStats(shipments) {
-                const total = shipments.length;
-                const highRisk = shipments.filter(s => s.very_late_risk > 0.7).length;
-                const mediumRisk = shipments.filter(s => s.very_late_risk > 0.3 && s.very_late_risk <= 0.7).length;
-                const lowRisk = total - highRisk - mediumRisk;
-                
-                document.getElementById('totalShipments').textContent = total;
-                document.getElementById('highRisk').textContent = highRisk;
-                
-                // Update chart
-                riskChart.data.datasets[0].data = [lowRisk, mediumRisk, highRisk];
-                riskChart.update();
-            }
-            
-            // Update shipment list
-            function updateShipmentList(shipments) {
-                const listContainer = document.getElementById('shipmentList');
-                listContainer.innerHTML = '';
-                
-                shipments.slice(0, 10).forEach(shipment => {
-                    const riskColor = getRiskColor(shipment.late_risk, shipment.very_late_risk);
-                    const riskLevel = getRiskLevel(shipment.late_risk, shipment.very_late_risk);
-                    
-                    const item = document.createElement('div');
-                    item.className = 'shipment-item';
-                    item.innerHTML = `
-                        <div style="display: flex; justify-content: space-between; align-items: center;">
-                            <div>
-                                <strong>${shipment.id}</strong><br>
-                                <small>${shipment.order_city}, ${shipment.order_state}</small>
-                            </div>
-                            <div style="color: ${riskColor}; font-weight: bold;">
-                                ${riskLevel}
-                            </div>
-                        </div>
-                    `;
-                    listContainer.appendChild(item);
-                });
-            }
-            
-            // Helper functions
-            function getRiskColor(lateRisk, veryLateRisk) {
-                if (veryLateRisk > 0.7) return '#e74c3c';
-                if (veryLateRisk > 0.3) return '#f39c12';
-                return '#27ae60';
-            }
-            
-            function getRiskLevel(lateRisk, veryLateRisk) {
-                if (veryLateRisk > 0.7) return 'High Risk';
-                if (veryLateRisk > 0.3) return 'Medium Risk';
-                return 'Low Risk';
-            }
-            
-            function clearMap() {
-                markers.forEach(marker => map.removeLayer(marker));
-                markers = [];
-            }
-            
-            function toggleAutoRefresh() {
-                if (autoRefreshInterval) {
-                    clearInterval(autoRefreshInterval);
-                    autoRefreshInterval = null;
-                } else {
-                    autoRefreshInterval = setInterval(refreshData, 5000); // Refresh every 5 seconds
-                }
-            }
-            
-            // Initialize everything
-            document.addEventListener('DOMContentLoaded', function() {
-                initMap();
-                initChart();
-                refreshData();
-                
-                // Auto refresh every 10 seconds
-                autoRefreshInterval = setInterval(refreshData, 10000);
-            });
-        </script>
-    </body>
-    </html>
-    """
-    return render_template_string(dashboard_html)
+    return static_html_response(DASHBOARD_PAGE)
 
 @app.route('/analytics')
 def analytics():
     """Analytics dashboard"""
-    analytics_html = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Shipment Analytics Dashboard</title>
-        <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-        <style>
-            body { font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5; }
-            .header { text-align: center; margin-bottom: 30px; }
-            .dashboard-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(400px, 1fr)); gap: 20px; }
-            .chart-card { background: white; border-radius: 8px; padding: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-            .chart-container { height: 300px; }
-            .metric-card { background: white; border-radius: 8px; padding: 20px; text-align: center; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-            .metric-value { font-size: 2.5em; font-weight: bold; color: #2c3e50; }
-            .metric-label { color: #7f8c8d; margin-top: 10px; }
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>📈 Shipment Analytics Dashboard</h1>
-            <p>Comprehensive analysis of shipment patterns and risk factors</p>
-        </div>
-        
-        <div class="dashboard-grid">
-            <div class="metric-card">
-                <div class="metric-value" id="avgAccuracy">86.14%</div>
-                <div class="metric-label">Late Model Accuracy</div>
-            </div>
-            
-            <div class="metric-card">
-                <div class="metric-value" id="avgRecall">97.58%</div>
-                <div class="metric-label">Very Late Model Recall</div>
-            </div>
-            
-            <div class="metric-card">
-                <div class="metric-value" id="totalPredictions">0</div>
-                <div class="metric-label">Total Predictions Today</div>
-            </div>
-            
-            <div class="chart-card">
-                <h3>Risk Distribution by Shipping Mode</h3>
-                <div class="chart-container">
-                    <canvas id="shippingModeChart"></canvas>
-                </div>
-            </div>
-            
-            <div class="chart-card">
-                <h3>Geographic Risk Analysis</h3>
-                <div class="chart-container">
-                    <canvas id="geographicChart"></canvas>
-                </div>
-            </div>
-            
-            <div class="chart-card">
-                <h3>Hourly Prediction Trends</h3>
-                <div class="chart-container">
-                    <canvas id="trendsChart"></canvas>
-                </div>
-            </div>
-        </div>
-
-        <script>
-            // Initialize charts
-            function initCharts() {
-                // Shipping Mode Risk Chart
-                const shippingCtx = document.getElementById('shippingModeChart').getContext('2d');
-                new Chart(shippingCtx, {
-                    type: 'bar',
-                    data: {
-                        labels: ['Standard Class', 'First Class', 'Second Class', 'Same Day'],
-                        datasets: [{
-                            label: 'Average Risk Score',
-                            data: [0.65, 0.25, 0.85, 0.15],
-                            backgroundColor: ['#e74c3c', '#f39c12', '#e74c3c', '#27ae60']
-                        }]
-                    },
-                    options: {
-                        responsive: true,
-                        maintainAspectRatio: false,
-                        scales: {
-                            y: {
-                                beginAtZero: true,
-                                max: 1
-                            }
-                        }
-                    }
-                });
-                
-                // Geographic Risk Chart
-                const geoCtx = document.getElementById('geographicChart').getContext('2d');
-                new Chart(geoCtx, {
-                    type: 'pie',
-                    data: {
-                        labels: ['North America', 'Europe', 'Asia', 'South America', 'Others'],
-                        datasets: [{
-                            data: [45, 25, 20, 7, 3],
-                            backgroundColor: ['#3498db', '#2ecc71', '#f39c12', '#e74c3c', '#9b59b6']
-                        }]
-                    },
-                    options: {
-                        responsive: true,
-                        maintainAspectRatio: false
-                    }
-                });
-                
-                // Trends Chart
-                const trendsCtx = document.getElementById('trendsChart').getContext('2d');
-                const hours = Array.from({length: 24}, (_, i) => i + ':00');
-                const predictions = Array.from({length: 24}, () => Math.floor(Math.random() * 50) + 10);
-                
-                new Chart(trendsCtx, {
-                    type: 'line',
-                    data: {
-                        labels: hours,
-                        datasets: [{
-                            label: 'Predictions per Hour',
-                            data: predictions,
-                            borderColor: '#3498db',
-                            backgroundColor: 'rgba(52, 152, 219, 0.1)',
-                            fill: true
-                        }]
-                    },
-                    options: {
-                        responsive: true,
-                        maintainAspectRatio: false,
-                        scales: {
-                            y: {
-                                beginAtZero: true
-                            }
-                        }
-                    }
-                });
-            }
+    return static_html_response(ANALYTICS_PAGE)
+
+def compute_shipments():
+    """Generate 20-50 sample shipments with late / very late risk predictions"""
+    # Generate 20-50 sample shipments
+    num_shipments = random.randint(20, 50)
+    shipments = [generate_sample_shipment() for _ in range(num_shipments)]
+    
+    # Get predictions if models are loaded; one predict_proba call per model
+    # for the whole batch instead of two per shipment
+    if late_model and very_late_model:
+        try:
+            X_processed = preprocess_input_batch(shipments)
+            # Convert each probability column to Python floats in one call
+            # rather than boxing a numpy scalar per shipment
+            late_probs = late_model.predict_proba(X_processed)[:, 1].tolist()
+            very_late_probs = very_late_model.predict_proba(X_processed)[:, 1].tolist()
             
-            // Update metrics
-            function updateMetrics() {
-                const totalPredictions = Math.floor(Math.random() * 1000) + 500;
-                document.getElementById('totalPredictions').textContent = totalPredictions.toLocaleString();
-            }
+            for shipment, late_prob, very_late_prob in zip(shipments, late_probs, very_late_probs):
+                shipment['late_risk'] = late_prob
+                shipment['very_late_risk'] = very_late_prob
+            return shipments
             
-            // Initialize everything
-            document.addEventListener('DOMContentLoaded', function() {
-                initCharts();
-                updateMetrics();
-                
-                // Update metrics every 30 seconds
-                setInterval(updateMetrics, 30000);
-            });
-        </script>
-    </body>
-    </html>
+        except Exception as e:
+            logger.error(f"Error generating predictions for shipments: {e}")
+    
+    # Use random values if models not loaded or prediction fails
+    for shipment in shipments:
+        shipment['late_risk'] = random.uniform(0.1, 0.9)
+        shipment['very_late_risk'] = random.uniform(0.1, 0.8)
+    
+    return shipments
+
+class ShipmentFeed:
     """
-    return render_template_string(analytics_html)
+    Keeps the latest shipment snapshot and publishes it to every client.
 
-@app.route('/api/shipments')
-def get_shipments():
-    """API endpoint to get sample shipment data with predictions"""
-    try:
-        shipments = []
-        
-        # Generate 20-50 sample shipments
-        num_shipments = random.randint(20, 50)
-        
-        for _ in range(num_shipments):
-            shipment = generate_sample_shipment()
+    One background thread regenerates the snapshot every `interval` seconds,
+    serializes it to JSON once and wakes all stream subscribers, so inference
+    and encoding run once per update no matter how many dashboards are
+    polling or connected. The thread pauses once nobody is subscribed and
+    nobody has polled for `idle_after` seconds (default: three intervals),
+    and resumes on the next access.
+    """
+
+    def __init__(self, interval, idle_after=None):
+        self.interval = interval
+        self.idle_after = 3 * interval if idle_after is None else idle_after
+        self._lock = threading.Lock()
+        self._reset()
+        # A forked worker (e.g. gunicorn --preload) must start its own thread
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._changed = threading.Condition()
+        self._snapshot = None
+        self._etag = None
+        self._version = 0
+        self._subscribers = 0
+        self._last_access = time.monotonic()
+        self._idle = False
+        self._thread = None
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="shipment-feed", daemon=True)
+                    self._thread.start()
+
+    def _in_demand(self):
+        return self._subscribers > 0 or time.monotonic() - self._last_access < self.idle_after
+
+    def _touch(self):
+        """Record client activity and wake a paused producer (caller holds the condition)"""
+        self._last_access = time.monotonic()
+        self._changed.notify_all()
+
+    def _run(self):
+        while True:
+            with self._changed:
+                if not self._in_demand():
+                    self._idle = True
+                    self._changed.wait_for(self._in_demand)
+                    self._idle = False
             
-            # Get predictions if models are loaded
-            if late_model and very_late_model:
-                try:
-                    X_processed = preprocess_input_data(shipment)
-                    
-                    # Get prediction probabilities
-                    late_prob = late_model.predict_proba(X_processed)[0][1]
-                    very_late_prob = very_late_model.predict_proba(X_processed)[0][1]
-                    
-                    shipment['late_risk'] = float(late_prob)
-                    shipment['very_late_risk'] = float(very_late_prob)
-                    
-                except Exception as e:
-                    logger.error(f"Error generating predictions for shipment: {e}")
-                    # Use random values if prediction fails
-                    shipment['late_risk'] = random.uniform(0.1, 0.9)
-                    shipment['very_late_risk'] = random.uniform(0.1, 0.8)
+            try:
+                snapshot = orjson.dumps(compute_shipments(), option=OrjsonProvider.OPTIONS)
+                etag = hashlib.md5(snapshot).hexdigest()
+            except Exception as e:
+                logger.error(f"Error generating shipments: {e}")
             else:
-                # Use random values if models not loaded
-                shipment['late_risk'] = random.uniform(0.1, 0.9)
-                shipment['very_late_risk'] = random.uniform(0.1, 0.8)
-            
-            shipments.append(shipment)
+                with self._changed:
+                    self._snapshot = snapshot
+                    self._etag = etag
+                    self._version += 1
+                    self._changed.notify_all()
+            time.sleep(self.interval)
+
+    def latest(self, timeout=30):
+        """
+        Return the most recent snapshot as (JSON bytes, ETag), waiting up to
+        `timeout` seconds for a fresh one if there is none yet or the feed
+        was paused
+        """
+        self._ensure_started()
+        with self._changed:
+            stale = self._idle or self._version == 0
+            version = self._version
+            self._touch()
+            if stale and not self._changed.wait_for(lambda: self._version > version, timeout):
+                raise TimeoutError("No shipment snapshot has been generated yet")
+            return self._snapshot, self._etag
+
+    def subscribe(self):
+        """Yield each newly published snapshot (JSON bytes) until the consumer closes the generator"""
+        self._ensure_started()
+        with self._changed:
+            self._subscribers += 1
+            self._touch()
         
-        return jsonify(shipments)
+        try:
+            version = 0
+            while True:
+                with self._changed:
+                    self._changed.wait_for(lambda: self._version != version)
+                    version, snapshot = self._version, self._snapshot
+                yield snapshot
+        finally:
+            with self._changed:
+                self._subscribers -= 1
+                self._last_access = time.monotonic()
+
+# Seconds between pushed shipment updates
+SHIPMENT_REFRESH_SECONDS = float(os.environ.get("SHIPMENT_REFRESH_SECONDS", 5))
+shipment_feed = ShipmentFeed(SHIPMENT_REFRESH_SECONDS)
+
+# Demo hourly prediction counts for the analytics trends chart, drawn once at
+# startup so every page load shows the same series
+HOURLY_TRENDS = np.random.default_rng().integers(10, 60, size=24).tolist()
+
+@app.route('/api/trends')
+def get_trends():
+    """API endpoint returning the predictions-per-hour series for the analytics page"""
+    return jsonify(HOURLY_TRENDS)
+
+@app.route('/api/shipments')
+def get_shipments():
+    """
+    API endpoint returning the latest sample shipment snapshot with predictions.
+
+    Pollers that send the snapshot's ETag back get 304 Not Modified until the
+    feed publishes a new one.
+    """
+    try:
+        snapshot, etag = shipment_feed.latest()
+        response = app.response_class(snapshot, mimetype="application/json")
+        response.headers["Cache-Control"] = "no-cache"
+        response.set_etag(etag)
+        return response.make_conditional(request)
         
     except Exception as e:
         logger.error(f"Error generating shipments: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/shipments/stream')
+def stream_shipments():
+    """Server-sent events stream pushing each new shipment snapshot"""
+    def events():
+        for shipments in shipment_feed.subscribe():
+            yield b"event: shipments\ndata: " + shipments + b"\n\n"
+    
+    return app.response_class(
+        events(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 if __name__ == '__main__':
-    app.run(host='localhost', port=5000, debug=True)
\ No newline at end of file
+    # Development server only; in production serve wsgi:app with gunicorn
+    # (gunicorn -c gunicorn.conf.py wsgi:app). The debugger and reloader are
+    # opt-in via FLASK_DEBUG=1 since they slow down every request.
+    debug = os.environ.get("FLASK_DEBUG", "0").lower() in ("1", "true")
+    app.run(host='localhost', port=5000, debug=debug, threaded=True)
\ No newline at end of file
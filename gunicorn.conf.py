@@ -0,0 +1,23 @@
+"""
+gunicorn.conf.py
+
+Gunicorn settings for serving the Flask app with gevent async workers.
+
+Any value can be overridden on the command line, e.g.:
+    gunicorn -c gunicorn.conf.py --workers 2 wsgi:app
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+
+# One worker per core: predictions are CPU-bound, while gevent lets each
+# worker keep many lightweight requests (JSON parsing, HTML pages) in flight
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gevent"
+worker_connections = 1000
+
+# Import the app (and load every model) once in the master; forked workers
+# then share the loaded artifacts copy-on-write instead of each unpickling them
+preload_app = True
@@ -14,6 +14,7 @@ from pathlib import Path
 from fastapi import APIRouter, HTTPException
 from api.shipment_schema import ShipmentFeatures
 from src.preprocess_features import NUMERICAL_FEATURES, ONEHOT_FEATURES, LABEL_FEATURES
+import numpy as np
 import pandas as pd
 import joblib
 from src.logger import get_logger
@@ -65,21 +66,19 @@ async def predict_very_late(shipment_features: ShipmentFeatures):
     X_onehot_encoded = onehot_encoder.transform(X_onehot)
     X_label_encoded = ordinal_encoder.transform(X_label)
     
-    X_num_scaled = pd.DataFrame(X_num_scaled, columns=NUMERICAL_FEATURES, index=X_unprocessed.index)
-    X_onehot_encoded = pd.DataFrame(
-        X_onehot_encoded,
-        columns=onehot_encoder.get_feature_names_out(ONEHOT_FEATURES),
-        index=X_unprocessed.index
-    )
-    X_label_encoded = pd.DataFrame(X_label_encoded, columns=LABEL_FEATURES, index=X_unprocessed.index)
-    
-    X_processed = pd.concat([X_num_scaled, X_onehot_encoded, X_label_encoded], axis=1)
+    # The transforms already return ndarrays in training column order;
+    # stack them directly instead of re-wrapping and aligning DataFrames
+    X_processed = np.hstack([X_num_scaled, X_onehot_encoded, X_label_encoded]).astype(np.float32, copy=False)
     logger.debug(f"X_processed shape: {X_processed.shape}")
    
     # ─────────────────────────────────────────────
     # Load trained model and generate prediction
     # ─────────────────────────────────────────────
     very_late_model = load_artifact(very_late_model_file, "very_late_model")
+    # X_processed is a bare ndarray in training column order; drop the fitted
+    # column names so sklearn does not warn that X has no feature names
+    if hasattr(very_late_model, "feature_names_in_"):
+        del very_late_model.feature_names_in_
     logger.info("Very late model loaded successfully")
     is_very_late = very_late_model.predict(X_processed)[0]
     
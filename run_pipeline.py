@@ -3,7 +3,7 @@ run_pipeline.py
 
 Main script to run the machine learning pipeline for predicting late shipments.
 Steps include loading raw data, cleaning, feature engineering, preprocessing, 
-model training, and evaluation.
+model training, evaluation, and ONNX export.
 Logs progress and errors to both console and log file.
 """
 
@@ -15,6 +15,7 @@ from src.feature_engineering import engineer_features
 from src.preprocess_features import preprocess_features
 from src.train_late_model import train_late_model
 from src.train_very_late_model import train_very_late_model
+from src.onnx_model import export_model_to_onnx
 import time
 
 logger = get_logger(__name__)
@@ -32,6 +33,8 @@ unprocessed_data_dir = base_dir / "data" / "unprocessed"
 preprocessed_data_dir = base_dir / "data" / "preprocessed"
 late_model_file = base_dir / "models" / "late_model.pkl"
 very_late_model_file = base_dir / "models" / "very_late_model.pkl"
+late_model_onnx_file = base_dir / "models" / "late_model.onnx"
+very_late_model_onnx_file = base_dir / "models" / "very_late_model.onnx"
 scaler_file = base_dir / "models" / "scaler.pkl"
 onehot_encoder_file = base_dir / "models" / "onehot_encoder.pkl"
 ordinal_encoder_file = base_dir / "models" / "ordinal_encoder.pkl"
@@ -110,6 +113,14 @@ def main():
             model_file=very_late_model_file
         )
         
+        # ─────────────────────────────────────────────
+        # Step 7: Export models to ONNX for low-latency serving
+        # ─────────────────────────────────────────────
+        logger.info("- Step 7: Export models to ONNX")
+        n_features = processed_data["X_train"].shape[1]
+        export_model_to_onnx(late_model_file, late_model_onnx_file, n_features)
+        export_model_to_onnx(very_late_model_file, very_late_model_onnx_file, n_features)
+        
         duration = time.time() - start
         minutes = int(duration // 60)
         seconds = duration % 60
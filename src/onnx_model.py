@@ -0,0 +1,123 @@
+"""
+onnx_model.py
+
+This module converts the trained Random Forest models to ONNX and serves them
+through ONNX Runtime.
+
+This module performs:
+- Model export from the saved joblib file to an `.onnx` file (skl2onnx)
+- Loading of an `.onnx` file into an ONNX Runtime inference session
+- A small `predict` / `predict_proba` wrapper so the Flask app can use the
+  session exactly like the original scikit-learn estimator
+
+ONNX Runtime evaluates the trees in float32, so predictions can differ from
+scikit-learn for the rare inputs that fall exactly on a split threshold.
+
+Used in: run_pipeline.py (Step 7) and app.py (model loading)
+"""
+
+import joblib
+import numpy as np
+from pathlib import Path
+from src.logger import get_logger
+
+try:
+    import onnxruntime as ort
+except ImportError:  # optional: the app falls back to the joblib models
+    ort = None
+
+
+logger = get_logger(__name__)
+
+
+def export_model_to_onnx(model_file, onnx_file, n_features):
+    """
+    Converts a saved scikit-learn classifier to ONNX.
+
+    Parameters:
+        model_file (str or Path): Path to the joblib-serialized model
+        onnx_file (str or Path): Path where the ONNX model should be saved
+        n_features (int): Number of columns in the preprocessed feature matrix
+
+    Returns:
+        None
+
+    Raises:
+        Exception: If the model cannot be loaded, converted, or saved
+    """
+
+    try:
+        from skl2onnx import convert_sklearn
+        from skl2onnx.common.data_types import FloatTensorType
+
+        model = joblib.load(model_file)
+        logger.info(f"Converting {model_file} to ONNX...")
+
+        # zipmap=False returns probabilities as a plain (n_samples, n_classes) tensor
+        onnx_model = convert_sklearn(
+            model,
+            initial_types=[("X", FloatTensorType([None, n_features]))],
+            options={id(model): {"zipmap": False}}
+        )
+
+        onnx_file = Path(onnx_file)
+        onnx_file.parent.mkdir(parents=True, exist_ok=True)
+        onnx_file.write_bytes(onnx_model.SerializeToString())
+        logger.info(f"ONNX model saved to: {onnx_file}")
+
+    except Exception as e:
+        logger.error(f"Failed to export {model_file} to ONNX: {e}", exc_info=True)
+        raise
+
+
+class OnnxModel:
+    """
+    Wraps an ONNX Runtime session behind the scikit-learn classifier interface.
+
+    Parameters:
+        onnx_file (str or Path): Path to the exported `.onnx` model
+        providers (list[str], optional): Execution providers in priority order
+            (defaults to CPUExecutionProvider)
+    """
+
+    def __init__(self, onnx_file, providers=None):
+        # Pin the full graph optimization level (node fusion, layout
+        # transforms) so it does not depend on the ONNX Runtime default
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        self.session = ort.InferenceSession(
+            str(onnx_file),
+            sess_options=session_options,
+            providers=providers or ["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        self.n_features_in_ = self.session.get_inputs()[0].shape[1]
+
+    def predict(self, X):
+        """Returns class labels for each row of X"""
+        return self.session.run(["label"], {self.input_name: np.asarray(X, dtype=np.float32)})[0]
+
+    def predict_proba(self, X):
+        """Returns class probabilities, shape (n_samples, n_classes)"""
+        return self.session.run(["probabilities"], {self.input_name: np.asarray(X, dtype=np.float32)})[0]
+
+
+def load_onnx_model(onnx_file, providers=None):
+    """
+    Loads an ONNX model if the file exists and ONNX Runtime is installed.
+
+    Parameters:
+        onnx_file (str or Path): Path to the exported `.onnx` model
+        providers (list[str], optional): Execution providers in priority order
+
+    Returns:
+        OnnxModel or None: The wrapped session, or None if ONNX is unavailable
+    """
+
+    if ort is None or not Path(onnx_file).exists():
+        return None
+
+    model = OnnxModel(onnx_file, providers)
+    logger.info(f"Loaded ONNX model from: {onnx_file}")
+    return model
@@ -0,0 +1,90 @@
+/*
+ * charts.js
+ *
+ * Chart.js factories shared by the dashboard (/dashboard) and analytics
+ * (/analytics) pages. Load after Chart.js; both pages use `defer`, which
+ * keeps script order.
+ */
+
+// Options every chart on the site uses
+const BASE_CHART_OPTIONS = {
+    responsive: true,
+    maintainAspectRatio: false
+};
+
+// Create a chart on the canvas with the given id, merging in the base options
+function createChart(canvasId, type, data, options = {}) {
+    const ctx = document.getElementById(canvasId).getContext('2d');
+    return new Chart(ctx, {
+        type,
+        data,
+        options: { ...BASE_CHART_OPTIONS, ...options }
+    });
+}
+
+// Dashboard: low / medium / high risk shipment counts
+function makeRiskDoughnut(canvasId) {
+    return createChart(canvasId, 'doughnut', {
+        labels: ['Low Risk', 'Medium Risk', 'High Risk'],
+        datasets: [{
+            data: [0, 0, 0],
+            backgroundColor: ['#27ae60', '#f39c12', '#e74c3c']
+        }]
+    }, {
+        plugins: {
+            legend: {
+                position: 'bottom'
+            }
+        }
+    });
+}
+
+// Analytics: average risk score per shipping mode
+function makeShippingModeBar(canvasId) {
+    return createChart(canvasId, 'bar', {
+        labels: ['Standard Class', 'First Class', 'Second Class', 'Same Day'],
+        datasets: [{
+            label: 'Average Risk Score',
+            data: [0.65, 0.25, 0.85, 0.15],
+            backgroundColor: ['#e74c3c', '#f39c12', '#e74c3c', '#27ae60']
+        }]
+    }, {
+        scales: {
+            y: {
+                beginAtZero: true,
+                max: 1
+            }
+        }
+    });
+}
+
+// Analytics: share of shipments per region
+function makeGeographicPie(canvasId) {
+    return createChart(canvasId, 'pie', {
+        labels: ['North America', 'Europe', 'Asia', 'South America', 'Others'],
+        datasets: [{
+            data: [45, 25, 20, 7, 3],
+            backgroundColor: ['#3498db', '#2ecc71', '#f39c12', '#e74c3c', '#9b59b6']
+        }]
+    });
+}
+
+// Analytics: predictions per hour
+function makeTrendsLine(canvasId, labels, predictions) {
+    return createChart(canvasId, 'line', {
+        labels,
+        datasets: [{
+            label: 'Predictions per Hour',
+            data: predictions,
+            borderColor: '#3498db',
+            backgroundColor: 'rgba(52, 152, 219, 0.1)',
+            fill: true
+        }]
+    }, {
+        scales: {
+            y: {
+                beginAtZero: true
+            }
+        }
+    });
+}
@@ -0,0 +1,198 @@
+"""
+tests/test_app.py
+
+Integration tests for the Flask application in app.py:
+- Landing page (`/`) and dashboard (`/dashboard`)
+- Health check (`/ping`)
+- Batch prediction (`/predict_batch`)
+- Shipment snapshot (`/api/shipments`) and analytics trends (`/api/trends`)
+"""
+
+import gzip
+import time
+import numpy as np
+# Import the app before sklearn so the suite runs with the same sklearn
+# configuration the app sets up when it is served
+import app as app_module
+from app import (
+    app, scaling_params, preprocess_input_data, preprocess_input_batch,
+    scaler, onehot_encoder, ordinal_encoder, ShipmentFeed
+)
+from sklearn.preprocessing import MinMaxScaler, RobustScaler, StandardScaler
+from src.preprocess_features import NUMERICAL_FEATURES, ONEHOT_FEATURES, LABEL_FEATURES
+
+client = app.test_client()
+
+SAMPLE_SHIPMENT = {
+    "order_item_quantity": 3,
+    "order_item_total": 136.44,
+    "product_price": 49.97,
+    "year": 2016,
+    "month": 2,
+    "day": 17,
+    "order_value": 805.22,
+    "unique_items_per_order": 5,
+    "order_item_discount_rate": 0.09,
+    "units_per_order": 13,
+    "order_profit_per_order": 65.48,
+    "type": "DEBIT",
+    "customer_segment": "Corporate",
+    "shipping_mode": "First Class",
+    "category_id": 46,
+    "customer_country": "EE. UU.",
+    "customer_state": "CA",
+    "department_id": 7,
+    "order_city": "Adelaide",
+    "order_country": "Australia",
+    "order_region": "Oceania",
+    "order_state": "Australia del Sur"
+}
+
+def test_root():
+    response = client.get("/")
+    assert response.status_code == 200
+    assert "Late Shipment Prediction API" in response.get_data(as_text=True)
+    assert "max-age" in response.headers["Cache-Control"]
+
+def test_root_not_modified():
+    etag = client.get("/").headers["ETag"]
+    response = client.get("/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.get_data() == b""
+
+def test_ping():
+    response = client.get("/ping")
+    assert response.status_code == 200
+    assert response.get_json() == {"status": "ok"}
+
+def test_predict_batch():
+    second = dict(SAMPLE_SHIPMENT, shipping_mode="Standard Class")
+    response = client.post("/predict_batch", json=[SAMPLE_SHIPMENT, second])
+
+    assert response.status_code == 200
+    result = response.get_json()
+    assert len(result) == 2
+    for prediction in result:
+        assert isinstance(prediction["late_prediction"], int)
+        assert isinstance(prediction["very_late_prediction"], int)
+
+def test_predict_batch_matches_single():
+    batch = client.post("/predict_batch", json=[SAMPLE_SHIPMENT]).get_json()[0]
+    single = client.post("/predict_both", json=SAMPLE_SHIPMENT).get_json()
+
+    assert batch["late_prediction"] == single["late_prediction"]
+    assert batch["very_late_prediction"] == single["very_late_prediction"]
+
+def test_predict_both_very_late_implies_late():
+    result = client.post("/predict_both", json=SAMPLE_SHIPMENT).get_json()
+    assert result["very_late_prediction"] <= result["late_prediction"]
+
+def test_predict_batch_rejects_non_list():
+    response = client.post("/predict_batch", json=SAMPLE_SHIPMENT)
+    assert response.status_code == 400
+
+def test_dashboard_gzip():
+    plain = client.get("/dashboard")
+    response = client.get("/dashboard", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert gzip.decompress(response.get_data()) == plain.get_data()
+
+def test_shipments_snapshot_shared():
+    first = client.get("/api/shipments").get_json()
+    second = client.get("/api/shipments").get_json()
+
+    assert 20 <= len(first) <= 50
+    assert first == second
+
+def test_shipments_not_modified():
+    etag = client.get("/api/shipments").headers["ETag"]
+    response = client.get("/api/shipments", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+def test_trends():
+    first = client.get("/api/trends").get_json()
+    assert len(first) == 24
+    assert first == client.get("/api/trends").get_json()
+
+def test_predict_ignores_extra_fields():
+    payload = dict(SAMPLE_SHIPMENT, id="SH123456", meta={"source": "test"}, tags=["a", "b"])
+    response = client.post("/predict_both", json=payload)
+
+    assert response.status_code == 200
+    assert response.get_json() == client.post("/predict_both", json=SAMPLE_SHIPMENT).get_json()
+
+def test_predict_missing_field():
+    payload = {k: v for k, v in SAMPLE_SHIPMENT.items() if k != "order_value"}
+    assert client.post("/predict_late", json=payload).status_code == 400
+
+def test_scaling_params_match_transform():
+    X = np.random.default_rng(0).normal(5, 3, size=(50, 4))
+    for scaler in (StandardScaler(), StandardScaler(with_mean=False), RobustScaler(),
+                   RobustScaler(with_centering=False), RobustScaler(with_scaling=False)):
+        center, scale = scaling_params(scaler.fit(X))
+        assert np.allclose((X - center) / scale, scaler.transform(X))
+
+    assert scaling_params(MinMaxScaler().fit(X)) is None
+
+def test_preprocessing_matches_fitted_transformers():
+    rows = [
+        SAMPLE_SHIPMENT,
+        dict(SAMPLE_SHIPMENT, type="CASH", customer_segment="Consumer", shipping_mode="Same Day"),
+        # Unknown one-hot categories encode as all zeros
+        dict(SAMPLE_SHIPMENT, type="BARTER", shipping_mode="Teleport"),
+        # Unknown ordinal categories encode as the encoder's unknown_value
+        dict(SAMPLE_SHIPMENT, order_city="Atlantis", customer_state="ZZ", category_id=9999)
+    ]
+    expected = np.hstack([
+        scaler.transform(np.array([[r[k] for k in NUMERICAL_FEATURES] for r in rows], dtype=np.float64)),
+        onehot_encoder.transform(np.array([[r[k] for k in ONEHOT_FEATURES] for r in rows], dtype=object)),
+        ordinal_encoder.transform(np.array([[r[k] for k in LABEL_FEATURES] for r in rows], dtype=object))
+    ])
+
+    assert np.allclose(preprocess_input_batch(rows), expected, atol=1e-5)
+    for row, expected_row in zip(rows, expected):
+        assert np.allclose(preprocess_input_data(row)[0], expected_row, atol=1e-5)
+
+def test_shipments_stream():
+    response = client.get("/api/shipments/stream")
+    try:
+        assert response.mimetype == "text/event-stream"
+        first = next(iter(response.response))
+        assert first.startswith(b"event: shipments\ndata: [")
+    finally:
+        response.close()
+
+def test_shipments_fallback_when_prediction_fails(monkeypatch):
+    class BrokenModel:
+        def predict_proba(self, X):
+            raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(app_module, "late_model", BrokenModel())
+    for shipment in app_module.compute_shipments():
+        assert 0 <= shipment["late_risk"] <= 1
+        assert 0 <= shipment["very_late_risk"] <= 1
+
+def test_shipment_feed_pauses_when_idle():
+    feed = ShipmentFeed(interval=0.01, idle_after=0.05)
+    feed.latest()
+    time.sleep(0.3)
+
+    # Nobody polled for longer than idle_after, so the producer stopped
+    paused_at = feed._version
+    time.sleep(0.2)
+    assert feed._version == paused_at
+
+    # The next poll resumes it and is answered with a fresh snapshot
+    feed.latest()
+    assert feed._version > paused_at
+
+def test_predict_rejects_out_of_range_values():
+    payload = dict(SAMPLE_SHIPMENT, order_value=1e308)
+
+    assert client.post("/predict_both", json=payload).status_code == 400
+    assert client.post("/predict_batch", json=[SAMPLE_SHIPMENT, payload]).status_code == 400
+    # The batcher's per-row fallback isolates the bad payload
+    assert client.post("/predict_late", json=payload).status_code == 400
+    assert client.post("/predict_late", json=SAMPLE_SHIPMENT).status_code == 200
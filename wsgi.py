@@ -0,0 +1,17 @@
+"""
+wsgi.py
+
+WSGI entry point for serving the Flask app (app.py) with gunicorn and
+gevent workers.
+
+gevent's monkey patching must run before anything else is imported so that
+sockets, threads and queues used by the app cooperate with the event loop.
+
+Usage:
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from gevent import monkey
+monkey.patch_all()
+
+from app import app  # noqa: E402